@@ -1,3 +1,4 @@
+import contextlib
 import json
 import os
 import secrets
@@ -24,6 +25,7 @@ FRONTEND_DIR_ABS = os.path.abspath(FRONTEND_DIR)
 SESSION_DURATION_SECONDS = 60 * 60 * 8
 ACTIVE_SESSIONS = {}
 _DB_INITIALIZED = False
+_CONTRACTS_CACHE: Dict[str, Any] = {'key': None, 'data': {}}
 
 ADMIN_ROLE_NAMES = {'admin', 'administrador'}
 
@@ -88,6 +90,15 @@ SERVICE_FIELD_DEFINITIONS: Dict[str, Dict[str, Dict[str, Any]]] = {
 SUPPORTED_SERVICE_NAMES = set(SERVICE_FIELD_DEFINITIONS.keys())
 MIGRATIONS_TABLE = 'schema_migrations'
 
+SERVICE_CONFIG_ALL_QUERY = (
+    'SELECT service, key, value, description, metadata, updated_at '
+    'FROM service_integrations ORDER BY service, key'
+)
+SERVICE_CONFIG_BY_SERVICE_QUERY = (
+    'SELECT service, key, value, description, metadata, updated_at '
+    'FROM service_integrations WHERE service = %s ORDER BY service, key'
+)
+
 
 class PasswordValidationError(ValueError):
     """Raised when the provided password cannot be processed."""
@@ -138,6 +149,13 @@ def get_db_connection():
     return psycopg.connect(**db_config)
 
 
+@contextlib.contextmanager
+def db_cursor(**cursor_kwargs):
+    with get_db_connection() as conn:
+        with conn.cursor(**cursor_kwargs) as cur:
+            yield cur
+
+
 def is_admin_role(role: Optional[str]) -> bool:
     if not role:
         return False
@@ -200,19 +218,15 @@ def apply_sql_migrations(conn) -> None:
 
 
 def load_service_config_rows(service: Optional[str] = None) -> Iterable[Dict[str, Any]]:
-    query = (
-        'SELECT service, key, value, description, metadata, updated_at '
-        'FROM service_integrations'
-    )
-    params: tuple = ()
     if service:
-        query += ' WHERE service = %s'
-        params = (service,)
-    query += ' ORDER BY service, key'
-    with get_db_connection() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(query, params)
-            rows = cur.fetchall()
+        query = SERVICE_CONFIG_BY_SERVICE_QUERY
+        params: tuple = (service,)
+    else:
+        query = SERVICE_CONFIG_ALL_QUERY
+        params = ()
+    with db_cursor(row_factory=dict_row) as cur:
+        cur.execute(query, params)
+        rows = cur.fetchall()
     normalized = []
     for row in rows:
         normalized.append(
@@ -241,36 +255,39 @@ def persist_service_config(
 ) -> None:
     if not updates:
         return
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            for key, payload in updates.items():
-                metadata = payload.get('metadata') or {}
-                if not isinstance(metadata, dict):
-                    metadata = {}
-                try:
-                    metadata_json = json.dumps(metadata)
-                except (TypeError, ValueError):
-                    metadata_json = '{}'
-                cur.execute(
-                    """
-                    INSERT INTO service_integrations (
-                        service, key, value, description, metadata, updated_at
-                    )
-                    VALUES (%s, %s, %s, %s, %s::jsonb, NOW())
-                    ON CONFLICT (service, key) DO UPDATE
-                    SET value = EXCLUDED.value,
-                        description = EXCLUDED.description,
-                        metadata = EXCLUDED.metadata,
-                        updated_at = EXCLUDED.updated_at
-                    """,
-                    (
-                        service,
-                        key,
-                        payload.get('value') or '',
-                        payload.get('description'),
-                        metadata_json,
-                    ),
-                )
+    params = []
+    for key, payload in updates.items():
+        metadata = payload.get('metadata') or {}
+        if not isinstance(metadata, dict):
+            metadata = {}
+        try:
+            metadata_json = json.dumps(metadata)
+        except (TypeError, ValueError):
+            metadata_json = '{}'
+        params.append(
+            (
+                service,
+                key,
+                payload.get('value') or '',
+                payload.get('description'),
+                metadata_json,
+            )
+        )
+    with db_cursor() as cur:
+        cur.executemany(
+            """
+            INSERT INTO service_integrations (
+                service, key, value, description, metadata, updated_at
+            )
+            VALUES (%s, %s, %s, %s, %s::jsonb, NOW())
+            ON CONFLICT (service, key) DO UPDATE
+            SET value = EXCLUDED.value,
+                description = EXCLUDED.description,
+                metadata = EXCLUDED.metadata,
+                updated_at = EXCLUDED.updated_at
+            """,
+            params,
+        )
 
 
 def build_service_config_response(
@@ -433,6 +450,9 @@ def verify_password(raw_password, stored_hash):
 
 
 def init_db():
+    global _DB_INITIALIZED
+    if _DB_INITIALIZED:
+        return
     with get_db_connection() as conn:
         with conn.cursor() as cur:
             cur.execute(
@@ -466,13 +486,20 @@ def init_db():
                 """
             )
         apply_sql_migrations(conn)
+    _DB_INITIALIZED = True
 
 
 def load_contracts():
-    if not os.path.exists(CONTRACTS_PATH):
+    try:
+        st = os.stat(CONTRACTS_PATH)
+    except OSError:
         return {}
-    with open(CONTRACTS_PATH, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    key = (st.st_mtime_ns, st.st_size)
+    if _CONTRACTS_CACHE['key'] != key:
+        with open(CONTRACTS_PATH, 'r', encoding='utf-8') as f:
+            _CONTRACTS_CACHE['data'] = json.load(f)
+        _CONTRACTS_CACHE['key'] = key
+    return _CONTRACTS_CACHE['data']
 
 
 def create_session(slug):
@@ -522,14 +549,12 @@ def extract_token():
 def get_student_record(slug: str) -> Optional[Dict[str, Any]]:
     if not slug:
         return None
-    with get_db_connection() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(
-                'SELECT slug, name, role, email FROM students WHERE slug = %s',
-                (slug,),
-            )
-            row = cur.fetchone()
-            return dict(row) if row else None
+    with db_cursor(row_factory=dict_row) as cur:
+        cur.execute(
+            'SELECT slug, name, role, email FROM students WHERE slug = %s',
+            (slug,),
+        )
+        return cur.fetchone()
 
 
 def ensure_admin_access(slug: str, token: str) -> Tuple[bool, Any]:
@@ -775,7 +800,6 @@ app = Flask(__name__)
 
 @app.before_request
 def _ensure_database_initialized():
-    global _DB_INITIALIZED
     if _DB_INITIALIZED:
         return
     try:
@@ -783,7 +807,6 @@ def _ensure_database_initialized():
     except Exception as exc:
         print(f"Database initialization failed: {exc}", file=sys.stderr)
         raise
-    _DB_INITIALIZED = True
 
 
 @app.get('/api/health')
@@ -800,21 +823,19 @@ def api_status():
     if not validate_session(token, slug):
         return jsonify({'error': 'Unauthorized.'}), 401
     try:
-        with get_db_connection() as conn:
-            with conn.cursor(row_factory=dict_row) as cur:
-                cur.execute(
-                    'SELECT slug, name, role, workdir, email, created_at FROM students WHERE slug = %s',
-                    (slug,),
-                )
-                row = cur.fetchone()
-                if not row:
-                    return jsonify({'error': 'Student not found.'}), 404
-                student = dict(row)
-                cur.execute(
-                    'SELECT mission_id FROM completed_missions WHERE student_slug = %s ORDER BY completed_at',
-                    (slug,),
-                )
-                completed = [r['mission_id'] for r in cur.fetchall()]
+        with db_cursor(row_factory=dict_row) as cur:
+            cur.execute(
+                'SELECT slug, name, role, workdir, email, created_at FROM students WHERE slug = %s',
+                (slug,),
+            )
+            student = cur.fetchone()
+            if not student:
+                return jsonify({'error': 'Student not found.'}), 404
+            cur.execute(
+                'SELECT mission_id FROM completed_missions WHERE student_slug = %s ORDER BY completed_at',
+                (slug,),
+            )
+            completed = [r['mission_id'] for r in cur.fetchall()]
     except Exception as exc:
         print(f"Database error on /api/status: {exc}", file=sys.stderr)
         return jsonify({'error': 'Database connection error.'}), 500
@@ -824,10 +845,9 @@ def api_status():
 @app.get('/api/students')
 def api_students():
     try:
-        with get_db_connection() as conn:
-            with conn.cursor(row_factory=dict_row) as cur:
-                cur.execute('SELECT slug, name FROM students ORDER BY name')
-                students = [dict(row) for row in cur.fetchall()]
+        with db_cursor(row_factory=dict_row) as cur:
+            cur.execute('SELECT slug, name FROM students ORDER BY name')
+            students = cur.fetchall()
     except Exception as exc:
         print(f"Database error on /api/students: {exc}", file=sys.stderr)
         return jsonify({'error': 'Database connection error.'}), 500
@@ -898,21 +918,20 @@ def api_enroll():
         print(f"Password hashing error on /api/enroll: {exc}", file=sys.stderr)
         return jsonify({'error': 'Failed to process password.'}), 500
     try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    INSERT INTO students (slug, name, role, workdir, email, password_hash)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (slug) DO UPDATE
-                    SET name = EXCLUDED.name,
-                        role = EXCLUDED.role,
-                        workdir = EXCLUDED.workdir,
-                        email = EXCLUDED.email,
-                        password_hash = EXCLUDED.password_hash
-                    """,
-                    (slug, name, role, workdir, email, password_hash),
-                )
+        with db_cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO students (slug, name, role, workdir, email, password_hash)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON CONFLICT (slug) DO UPDATE
+                SET name = EXCLUDED.name,
+                    role = EXCLUDED.role,
+                    workdir = EXCLUDED.workdir,
+                    email = EXCLUDED.email,
+                    password_hash = EXCLUDED.password_hash
+                """,
+                (slug, name, role, workdir, email, password_hash),
+            )
     except Exception as exc:
         print(f"Database error on /api/enroll: {exc}", file=sys.stderr)
         return jsonify({'error': 'Database connection error.'}), 500
@@ -930,13 +949,12 @@ def api_login():
     if not slug or not password_for_check or not password_for_check.strip():
         return jsonify({'error': 'Missing slug or password.'}), 400
     try:
-        with get_db_connection() as conn:
-            with conn.cursor(row_factory=dict_row) as cur:
-                cur.execute(
-                    'SELECT slug, name, role, workdir, email, password_hash, created_at FROM students WHERE slug = %s',
-                    (slug,),
-                )
-                row = cur.fetchone()
+        with db_cursor(row_factory=dict_row) as cur:
+            cur.execute(
+                'SELECT slug, name, role, workdir, email, password_hash, created_at FROM students WHERE slug = %s',
+                (slug,),
+            )
+            row = cur.fetchone()
     except Exception as exc:
         print(f"Database error on /api/login lookup: {exc}", file=sys.stderr)
         return jsonify({'error': 'Database connection error.'}), 500
@@ -974,13 +992,12 @@ def api_verify_mission():
     if not validate_session(token, slug):
         return jsonify({'error': 'Unauthorized.'}), 401
     try:
-        with get_db_connection() as conn:
-            with conn.cursor(row_factory=dict_row) as cur:
-                cur.execute('SELECT workdir FROM students WHERE slug = %s', (slug,))
-                row = cur.fetchone()
-                if not row:
-                    return jsonify({'error': 'Student not found.'}), 404
-                workdir = row['workdir']
+        with db_cursor(row_factory=dict_row) as cur:
+            cur.execute('SELECT workdir FROM students WHERE slug = %s', (slug,))
+            row = cur.fetchone()
+            if not row:
+                return jsonify({'error': 'Student not found.'}), 404
+            workdir = row['workdir']
     except Exception as exc:
         print(f"Database error on /api/verify_mission lookup: {exc}", file=sys.stderr)
         return jsonify({'error': 'Database connection error.'}), 500
@@ -1009,16 +1026,15 @@ def api_verify_mission():
         )
     if passed:
         try:
-            with get_db_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute(
-                        """
-                        INSERT INTO completed_missions (student_slug, mission_id)
-                        VALUES (%s, %s)
-                        ON CONFLICT (student_slug, mission_id) DO NOTHING
-                        """,
-                        (slug, mission_id),
-                    )
+            with db_cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO completed_missions (student_slug, mission_id)
+                    VALUES (%s, %s)
+                    ON CONFLICT (student_slug, mission_id) DO NOTHING
+                    """,
+                    (slug, mission_id),
+                )
         except Exception as exc:
             print(
                 f"Database error on /api/verify_mission record: {exc}",
@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+import werkzeug
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import backend.app as backend_app
+
+
+def pytest_configure(config):
+    # Flask 2.3 lee werkzeug.__version__ al crear el cliente de pruebas y Werkzeug 3 ya no lo expone.
+    if not hasattr(werkzeug, '__version__'):
+        werkzeug.__version__ = '3.1.3'
+
+
+@pytest.fixture(scope='session')
+def flask_client():
+    backend_app.app.config['TESTING'] = True
+    return backend_app.app.test_client()
@@ -0,0 +1,46 @@
+import json
+import os
+
+import pytest
+
+import backend.app as backend_app
+
+
+@pytest.fixture
+def contracts_file(tmp_path, monkeypatch):
+    path = tmp_path / 'missions_contracts.json'
+    path.write_text(json.dumps({'m1': {'title': 'Primera'}}), encoding='utf-8')
+    monkeypatch.setattr(backend_app, 'CONTRACTS_PATH', str(path))
+    monkeypatch.setattr(backend_app, '_CONTRACTS_CACHE', {'key': None, 'data': {}})
+    return path
+
+
+def test_load_contracts_reuses_parsed_data(contracts_file):
+    first = backend_app.load_contracts()
+    second = backend_app.load_contracts()
+    assert first == {'m1': {'title': 'Primera'}}
+    assert second is first
+
+
+def test_load_contracts_reloads_when_file_changes(contracts_file):
+    first = backend_app.load_contracts()
+    mtime_ns = os.stat(contracts_file).st_mtime_ns
+    contracts_file.write_text(json.dumps({'m2': {'title': 'Segunda'}}), encoding='utf-8')
+    os.utime(contracts_file, ns=(mtime_ns + 1_000_000_000, mtime_ns + 1_000_000_000))
+    second = backend_app.load_contracts()
+    assert second == {'m2': {'title': 'Segunda'}}
+    assert second is not first
+
+
+def test_load_contracts_reloads_when_size_changes_with_same_mtime(contracts_file):
+    backend_app.load_contracts()
+    mtime_ns = os.stat(contracts_file).st_mtime_ns
+    contracts_file.write_text(json.dumps({'m1': {'title': 'Primera editada'}}), encoding='utf-8')
+    os.utime(contracts_file, ns=(mtime_ns, mtime_ns))
+    assert backend_app.load_contracts() == {'m1': {'title': 'Primera editada'}}
+
+
+def test_load_contracts_missing_file_returns_empty(tmp_path, monkeypatch):
+    monkeypatch.setattr(backend_app, 'CONTRACTS_PATH', str(tmp_path / 'missing.json'))
+    monkeypatch.setattr(backend_app, '_CONTRACTS_CACHE', {'key': None, 'data': {}})
+    assert backend_app.load_contracts() == {}
@@ -0,0 +1,142 @@
+import datetime
+
+import pytest
+from psycopg.rows import dict_row
+
+import backend.app as backend_app
+
+
+STUDENT_SLUG = 'ana'
+STUDENT_TOKEN = 'student-token'
+
+
+class FakeCursor:
+    def __init__(self, results=None):
+        self.results = list(results or [])
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+
+    def executemany(self, query, params_seq):
+        self.executed.append((query, list(params_seq)))
+
+    def fetchone(self):
+        return self.results.pop(0)
+
+    def fetchall(self):
+        return self.results.pop(0)
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self.fake_cursor = cursor
+        self.cursor_kwargs = []
+        self.committed = False
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.committed = True
+        self.closed = True
+        return False
+
+    def cursor(self, **kwargs):
+        self.cursor_kwargs.append(kwargs)
+        return self.fake_cursor
+
+
+@pytest.fixture
+def student_session(monkeypatch):
+    monkeypatch.setattr(backend_app, '_DB_INITIALIZED', True)
+    monkeypatch.setattr(
+        backend_app,
+        'ACTIVE_SESSIONS',
+        {STUDENT_TOKEN: {'slug': STUDENT_SLUG, 'created_at': backend_app.time.time()}},
+    )
+    return {'Authorization': f'Bearer {STUDENT_TOKEN}'}
+
+
+def install_connection(monkeypatch, results):
+    conn = FakeConnection(FakeCursor(results))
+    monkeypatch.setattr(backend_app, 'get_db_connection', lambda: conn)
+    return conn
+
+
+def test_status_returns_student_and_commits(flask_client, student_session, monkeypatch):
+    student = {
+        'slug': STUDENT_SLUG,
+        'name': 'Ana',
+        'role': 'student',
+        'workdir': '/home/ana',
+        'email': 'ana@example.com',
+        'created_at': datetime.datetime(2024, 1, 1),
+    }
+    conn = install_connection(
+        monkeypatch,
+        [student, [{'mission_id': 'm1'}, {'mission_id': 'm2'}]],
+    )
+
+    response = flask_client.get(f'/api/status?slug={STUDENT_SLUG}', headers=student_session)
+
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert payload['student']['slug'] == STUDENT_SLUG
+    assert payload['completed'] == ['m1', 'm2']
+    assert conn.cursor_kwargs == [{'row_factory': dict_row}]
+    assert [params for _, params in conn.fake_cursor.executed] == [(STUDENT_SLUG,), (STUDENT_SLUG,)]
+    assert conn.committed
+    assert conn.closed
+
+
+def test_status_unknown_student_closes_connection(flask_client, student_session, monkeypatch):
+    conn = install_connection(monkeypatch, [None])
+
+    response = flask_client.get(f'/api/status?slug={STUDENT_SLUG}', headers=student_session)
+
+    assert response.status_code == 404
+    assert response.get_json() == {'error': 'Student not found.'}
+    assert len(conn.fake_cursor.executed) == 1
+    assert conn.closed
+
+
+def test_persist_service_config_builds_params(monkeypatch):
+    conn = install_connection(monkeypatch, [])
+
+    backend_app.persist_service_config(
+        'github',
+        {
+            'token': {'value': 'ghp_nuevo', 'description': 'PAT', 'metadata': {'scope': 'repo'}},
+            'owner': {'value': None, 'description': None, 'metadata': {'x': object()}},
+            'repo': {'value': 'portal', 'metadata': ['no', 'dict']},
+        },
+    )
+
+    assert conn.cursor_kwargs == [{}]
+    [(query, params)] = conn.fake_cursor.executed
+    assert 'INSERT INTO service_integrations' in query
+    assert params == [
+        ('github', 'token', 'ghp_nuevo', 'PAT', '{"scope": "repo"}'),
+        ('github', 'owner', '', None, '{}'),
+        ('github', 'repo', 'portal', None, '{}'),
+    ]
+    assert conn.committed
+    assert conn.closed
+
+
+def test_persist_service_config_without_updates_skips_database(monkeypatch):
+    def fail():
+        raise AssertionError('No se debe abrir una conexión sin cambios.')
+
+    monkeypatch.setattr(backend_app, 'get_db_connection', fail)
+
+    backend_app.persist_service_config('github', {})
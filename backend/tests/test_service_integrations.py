@@ -1,34 +1,78 @@
-import os
-import sys
-import time
+import copy
 from types import SimpleNamespace
+from urllib.parse import urlsplit
 
 import pytest
 import requests
 
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-if PROJECT_ROOT not in sys.path:
-    sys.path.insert(0, PROJECT_ROOT)
-
 import backend.app as backend_app
-
-
-@pytest.fixture
-def client(monkeypatch):
-    backend_app._DB_INITIALIZED = True
-    backend_app.ACTIVE_SESSIONS.clear()
-    backend_app.ACTIVE_SESSIONS['valid-token'] = {
-        'slug': 'admin',
-        'created_at': time.time(),
-    }
-
-    store = {'github': {}, 'openai': {}}
-
-    def fake_load_rows(service=None):
+from backend.integrations import github as github_integration
+from backend.integrations import openai as openai_integration
+
+ADMIN_SLUG = 'admin'
+ADMIN_TOKEN = 'valid-token'
+UPDATED_AT = '2024-01-01T00:00:00Z'
+FROZEN_TIME = 1_704_067_200.0
+
+STORED_GITHUB_CONFIG = {
+    'token': {
+        'value': 'old-token',
+        'description': '',
+        'metadata': {},
+        'updated_at': UPDATED_AT,
+    },
+    'owner': {
+        'value': 'blockcorp',
+        'description': '',
+        'metadata': {},
+        'updated_at': UPDATED_AT,
+    },
+    'repository': {
+        'value': 'portal',
+        'description': '',
+        'metadata': {},
+        'updated_at': UPDATED_AT,
+    },
+}
+
+
+class FakeResponse(SimpleNamespace):
+    def json(self):
+        return getattr(self, 'payload', {})
+
+
+class FakeSession:
+    def __init__(self, responses=None, default=None):
+        self.headers = {}
+        self.responses = responses or {}
+        self.default = default
+
+    def get(self, url, timeout=10, params=None):
+        response = self.responses.get(urlsplit(url).path, self.default)
+        if response is None:
+            raise AssertionError(f'Unexpected URL {url}')
+        return response
+
+
+class FailingSession:
+    def __init__(self):
+        self.headers = {}
+
+    def get(self, url, timeout=10, params=None):
+        raise requests.RequestException('boom')
+
+
+class FakeServiceConfigStore:
+    def __init__(self):
+        self.services = {'github': {}, 'openai': {}}
+
+    def load_rows(self, service=None):
+        if service:
+            selected = [(service, self.services.get(service, {}))]
+        else:
+            selected = self.services.items()
         rows = []
-        for service_name, data in store.items():
-            if service and service_name != service:
-                continue
+        for service_name, data in selected:
             for key, payload in data.items():
                 rows.append(
                     {
@@ -42,39 +86,69 @@ def client(monkeypatch):
                 )
         return rows
 
-    def fake_load_values(service):
-        return {key: payload.get('value', '') for key, payload in store.get(service, {}).items()}
+    def load_values(self, service):
+        return {key: payload.get('value', '') for key, payload in self.services.get(service, {}).items()}
 
-    def fake_persist(service, updates):
-        service_store = store.setdefault(service, {})
+    def persist(self, service, updates):
+        service_store = self.services.setdefault(service, {})
         for key, payload in updates.items():
             service_store[key] = {
                 'value': payload.get('value', ''),
                 'description': payload.get('description') or '',
                 'metadata': payload.get('metadata') or {},
-                'updated_at': '2024-01-01T00:00:00Z',
+                'updated_at': UPDATED_AT,
             }
 
+
+GITHUB_OK_RESPONSES = {
+    '/user': FakeResponse(status_code=200, payload={'login': 'admin'}),
+    '/repos/blockcorp/portal': FakeResponse(status_code=200, payload={'full_name': 'blockcorp/portal'}),
+    '/user/repos': FakeResponse(status_code=200, payload={'data': []}),
+}
+
+
+@pytest.fixture
+def client(monkeypatch, flask_client):
+    monkeypatch.setattr(backend_app, '_DB_INITIALIZED', True)
+    monkeypatch.setattr(
+        backend_app,
+        'ACTIVE_SESSIONS',
+        {ADMIN_TOKEN: {'slug': ADMIN_SLUG, 'created_at': FROZEN_TIME}},
+    )
+    monkeypatch.setattr(backend_app, 'time', SimpleNamespace(time=lambda: FROZEN_TIME))
+
+    store = FakeServiceConfigStore()
+
     def fake_get_student_record(slug):
-        if slug == 'admin':
-            return {'slug': 'admin', 'role': 'Admin', 'name': 'Admin User'}
+        if slug == ADMIN_SLUG:
+            return {'slug': ADMIN_SLUG, 'role': 'Admin', 'name': 'Admin User'}
         return None
 
-    monkeypatch.setattr(backend_app, 'load_service_config_rows', fake_load_rows)
-    monkeypatch.setattr(backend_app, 'load_service_config_values', fake_load_values)
-    monkeypatch.setattr(backend_app, 'persist_service_config', fake_persist)
+    monkeypatch.setattr(backend_app, 'load_service_config_rows', store.load_rows)
+    monkeypatch.setattr(backend_app, 'load_service_config_values', store.load_values)
+    monkeypatch.setattr(backend_app, 'persist_service_config', store.persist)
     monkeypatch.setattr(backend_app, 'get_student_record', fake_get_student_record)
 
-    import werkzeug
+    return flask_client, store.services
+
+
+@pytest.fixture
+def github_session(monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(github_integration.requests, 'Session', lambda: session)
+    return session
 
-    if not hasattr(werkzeug, '__version__'):
-        monkeypatch.setattr(werkzeug, '__version__', '3.1.3', raising=False)
 
-    return backend_app.app.test_client(), store
+@pytest.fixture
+def openai_session(monkeypatch):
+    session = FailingSession()
+    monkeypatch.setattr(openai_integration.requests, 'Session', lambda: session)
+    return session
 
 
-def auth_headers(slug='admin', token='valid-token'):
-    return {'Authorization': f'Bearer {token}'}, {'slug': slug}
+@pytest.fixture(scope='module')
+def admin_headers():
+    return {'Authorization': f'Bearer {ADMIN_TOKEN}'}
 
 
 def test_admin_get_requires_slug(client):
@@ -85,10 +159,13 @@ def test_admin_get_requires_slug(client):
     assert 'slug' in (data.get('error') or '').lower()
 
 
-def test_admin_get_returns_definitions(client):
+def test_admin_get_returns_definitions(client, admin_headers):
     test_client, _ = client
-    headers, params = auth_headers()
-    response = test_client.get('/api/admin/service-configs', query_string=params, headers=headers)
+    response = test_client.get(
+        '/api/admin/service-configs',
+        query_string={'slug': ADMIN_SLUG},
+        headers=admin_headers,
+    )
     assert response.status_code == 200
     data = response.get_json()
     assert 'services' in data
@@ -98,68 +175,28 @@ def test_admin_get_returns_definitions(client):
     assert github_fields['token']['value'] == ''
 
 
-def test_post_github_invalid_credentials(client, monkeypatch):
+def test_post_github_invalid_credentials(client, admin_headers, github_session):
     test_client, store = client
+    github_session.default = FakeResponse(status_code=401, payload={'message': 'Bad credentials'})
 
-    class FakeResponse:
-        def __init__(self, status_code, payload=None):
-            self.status_code = status_code
-            self._payload = payload or {}
-
-        def json(self):
-            return self._payload
-
-    class FakeSession:
-        def __init__(self):
-            self.headers = {}
-
-        def get(self, url, timeout=10, params=None):
-            return FakeResponse(401, {'message': 'Bad credentials'})
-
-    from backend.integrations import github as github_integration
-
-    monkeypatch.setattr(github_integration.requests, 'Session', lambda: FakeSession())
-
-    headers, params = auth_headers()
     payload = {
-        'slug': params['slug'],
+        'slug': ADMIN_SLUG,
         'service': 'github',
         'values': {'token': 'bad', 'owner': 'org', 'repository': 'repo'},
     }
-    response = test_client.post('/api/admin/service-configs', json=payload, headers=headers)
+    response = test_client.post('/api/admin/service-configs', json=payload, headers=admin_headers)
     assert response.status_code == 400
-    data = response.get_json()
-    assert 'GitHub' in data.get('error', '') or 'token' in data.get('error', '').lower()
+    error = response.get_json().get('error', '')
+    assert 'GitHub' in error or 'token' in error.lower()
     assert store['github'] == {}
 
 
-def test_post_github_success(client, monkeypatch):
+def test_post_github_success(client, admin_headers, github_session):
     test_client, store = client
+    github_session.responses = dict(GITHUB_OK_RESPONSES)
 
-    class FakeResponse(SimpleNamespace):
-        def json(self):
-            return getattr(self, 'payload', {})
-
-    class FakeSession:
-        def __init__(self):
-            self.headers = {}
-
-        def get(self, url, timeout=10, params=None):
-            if url.endswith('/user'):
-                return FakeResponse(status_code=200, payload={'login': 'admin'})
-            if '/repos/' in url:
-                return FakeResponse(status_code=200, payload={'full_name': 'blockcorp/portal'})
-            if url.endswith('/user/repos'):
-                return FakeResponse(status_code=200, payload={'data': []})
-            raise AssertionError(f'Unexpected GitHub URL {url}')
-
-    from backend.integrations import github as github_integration
-
-    monkeypatch.setattr(github_integration.requests, 'Session', lambda: FakeSession())
-
-    headers, params = auth_headers()
     payload = {
-        'slug': params['slug'],
+        'slug': ADMIN_SLUG,
         'service': 'github',
         'values': {
             'token': 'ghp_demo',
@@ -167,7 +204,7 @@ def test_post_github_success(client, monkeypatch):
             'repository': 'portal',
         },
     }
-    response = test_client.post('/api/admin/service-configs', json=payload, headers=headers)
+    response = test_client.post('/api/admin/service-configs', json=payload, headers=admin_headers)
     assert response.status_code == 201
     data = response.get_json()
     assert data['test_result']['ok'] is True
@@ -176,86 +213,37 @@ def test_post_github_success(client, monkeypatch):
     assert store['github']['repository']['value'] == 'portal'
 
 
-def test_put_github_updates_token_only(client, monkeypatch):
+def test_put_github_updates_token_only(client, admin_headers, github_session):
     test_client, store = client
-    store['github'] = {
-        'token': {
-            'value': 'old-token',
-            'description': '',
-            'metadata': {},
-            'updated_at': '2024-01-01T00:00:00Z',
-        },
-        'owner': {
-            'value': 'blockcorp',
-            'description': '',
-            'metadata': {},
-            'updated_at': '2024-01-01T00:00:00Z',
-        },
-        'repository': {
-            'value': 'portal',
-            'description': '',
-            'metadata': {},
-            'updated_at': '2024-01-01T00:00:00Z',
-        },
+    store['github'] = copy.deepcopy(STORED_GITHUB_CONFIG)
+    github_session.responses = {
+        path: GITHUB_OK_RESPONSES[path] for path in ('/user', '/repos/blockcorp/portal')
     }
 
-    class FakeResponse(SimpleNamespace):
-        def json(self):
-            return getattr(self, 'payload', {})
-
-    class FakeSession:
-        def __init__(self):
-            self.headers = {}
-
-        def get(self, url, timeout=10, params=None):
-            if url.endswith('/user'):
-                return FakeResponse(status_code=200, payload={'login': 'admin'})
-            if '/repos/' in url:
-                return FakeResponse(status_code=200, payload={'full_name': 'blockcorp/portal'})
-            raise AssertionError(f'Unexpected GitHub URL {url}')
-
-    from backend.integrations import github as github_integration
-
-    monkeypatch.setattr(github_integration.requests, 'Session', lambda: FakeSession())
-
-    headers, params = auth_headers()
     payload = {
-        'slug': params['slug'],
+        'slug': ADMIN_SLUG,
         'service': 'github',
         'values': {
             'token': 'ghp_updated',
         },
     }
-    response = test_client.put('/api/admin/service-configs', json=payload, headers=headers)
+    response = test_client.put('/api/admin/service-configs', json=payload, headers=admin_headers)
     assert response.status_code == 200
     assert store['github']['token']['value'] == 'ghp_updated'
     assert store['github']['owner']['value'] == 'blockcorp'
     assert store['github']['repository']['value'] == 'portal'
 
 
-def test_post_openai_connection_error(client, monkeypatch):
+def test_post_openai_connection_error(client, admin_headers, openai_session):
     test_client, _ = client
-
-    class FailingSession:
-        def __init__(self):
-            self.headers = {}
-
-        def get(self, url, timeout=10):
-            raise requests.RequestException('boom')
-
-    from backend.integrations import openai as openai_integration
-
-    monkeypatch.setattr(openai_integration.requests, 'Session', lambda: FailingSession())
-
-    headers, params = auth_headers()
     payload = {
-        'slug': params['slug'],
+        'slug': ADMIN_SLUG,
         'service': 'openai',
         'values': {
             'api_key': 'sk-test',
         },
     }
-    response = test_client.post('/api/admin/service-configs', json=payload, headers=headers)
+    response = test_client.post('/api/admin/service-configs', json=payload, headers=admin_headers)
     assert response.status_code == 400
-    data = response.get_json()
-    assert 'OpenAI' in data.get('error', '') or 'credenciales' in data.get('error', '').lower()
+    error = response.get_json().get('error', '')
+    assert 'OpenAI' in error or 'credenciales' in error.lower()